@@ -3,8 +3,12 @@ Streamlit UI for Local Store Inventory Manager.
 Provides CRUD interface for products and category-based reports.
 """
 
+import json
+from collections import namedtuple
+
 import streamlit as st
-import pandas as pd
+# pandas is imported lazily inside the pages that build DataFrames, so sessions
+# that never visit them don't pay its import cost
 
 # Page configuration - MUST be first Streamlit command
 st.set_page_config(
@@ -14,15 +18,22 @@ st.set_page_config(
 )
 
 from db import (
-    init_db, get_all_categories, add_category, delete_category,
-    get_all_products, get_products_by_category, 
+    init_db, get_all_categories, add_category, add_categories_bulk, delete_category,
+    get_category_count,
+    get_all_products,
     add_product, update_product, delete_product, get_product_by_id,
-    get_category_report, get_connection
+    get_report_bundle, pool,
+    _SQL_ALL_PRODUCTS, _SQL_PRODUCTS_IN_CATEGORIES, _SQL_REPORT_IN_CATEGORIES
 )
-import sqlite3
 
-# Initialize database on app start
-init_db()
+# Initialize database once per process - st.cache_resource keeps the result across
+# reruns, so the schema checks don't run on every interaction
+@st.cache_resource
+def _bootstrap():
+    init_db()
+    return True
+
+_bootstrap()
 
 st.title("📦 Local Store Inventory Manager")
 st.markdown("---")
@@ -44,13 +55,124 @@ def reset_form():
     st.session_state.edit_mode = False
     st.session_state.editing_product_id = None
 
+# Button callbacks for the Products page - they run before the script reruns, so
+# the state change and cache invalidation are picked up without a second st.rerun()
+def start_edit(product_id):
+    st.session_state.edit_mode = True
+    st.session_state.editing_product_id = product_id
+
+def delete_product_clicked(product_id):
+    if delete_product(product_id):
+        clear_caches()
+        reset_form()
+        st.session_state.product_notice = ("success", "✅ Product deleted successfully!")
+    else:
+        st.session_state.product_notice = ("error", "❌ Failed to delete product.")
+
+# Queries shown in the Testing page's Query Plan Analysis, keyed by selectbox label.
+# These are the statements db.py actually runs, as (sql, params); the Reports page
+# statements get a sample category list for their ? bind
+_SAMPLE_CATEGORY_IDS = json.dumps([1])
+_EXPLAIN_QUERIES = {
+    "ORDER BY name (Products page)": (_SQL_ALL_PRODUCTS, ()),
+    "WHERE category_id IN (...) (Reports page)": (_SQL_PRODUCTS_IN_CATEGORIES, (_SAMPLE_CATEGORY_IDS,)),
+    "Aggregation with WHERE (Reports page)": (_SQL_REPORT_IN_CATEGORIES, (_SAMPLE_CATEGORY_IDS,)),
+}
+
+# st.fragment was added in Streamlit 1.33; older versions only have the experimental name
+fragment = getattr(st, "fragment", None) or st.experimental_fragment
+
+# Helper function to render large tables a window at a time, so only the visible
+# rows are serialized to the frontend on each rerun
+MAX_TABLE_ROWS = 500
+
+def show_table_window(df, key, formats=None):
+    start = 0
+    if len(df) > MAX_TABLE_ROWS:
+        start = st.slider("Start row", 0, len(df) - MAX_TABLE_ROWS, 0, key=key)
+    window = df.iloc[start:start + MAX_TABLE_ROWS]
+    st.dataframe(window.style.format(formats or {}), use_container_width=True, hide_index=True)
+    if len(df) > MAX_TABLE_ROWS:
+        st.caption(f"Showing {start}-{start + len(window)} of {len(df)}")
+
+# Cached read helpers - Streamlit reruns the whole script on every interaction,
+# so reads are memoized and only hit SQLite again after a mutation clears them
+
+# Category lookup structures, built once per cache fill instead of on every rerun:
+# (id, name) rows, name -> id, "name (ID: id)" -> id, names, name -> position
+CategoryMaps = namedtuple('CategoryMaps', 'categories id_by_name id_by_label names index_by_name')
+
+@st.cache_data(ttl=300)
+def _category_maps():
+    cats = get_all_categories()
+    names = [n for _, n in cats]
+    return CategoryMaps(
+        categories=cats,
+        id_by_name={n: i for i, n in cats},
+        id_by_label={f"{n} (ID: {i})": i for i, n in cats},
+        names=names,
+        index_by_name={n: pos for pos, n in enumerate(names)}
+    )
+
+# Rows are cached as dicts: sqlite3.Row can't be pickled by st.cache_data, and the
+# pages index product rows by column name
+@st.cache_data(ttl=300)
+def _cached_products():
+    return [p._asdict() for p in get_all_products()]
+
+# "name (ID: id)" -> product row for the product selectboxes, built once per cache
+# fill instead of formatting a label for every product on every rerun
+@st.cache_data(ttl=300)
+def _cached_product_options():
+    return {f"{p['name']} (ID: {p['product_id']})": p for p in _cached_products()}
+
+@st.cache_data(ttl=300)
+def _cached_product(product_id):
+    product = get_product_by_id(product_id)
+    return product._asdict() if product else None
+
+@st.cache_data(ttl=300)
+def _cached_report_bundle(category_ids):
+    # category_ids is a sorted tuple so it can be hashed as the cache key and
+    # the same selection in a different order shares one cache entry
+    report, products = get_report_bundle(list(category_ids) if category_ids else None)
+    return report, [dict(p) for p in products]
+
+# Index names on the Products table for the Testing page - schema rarely changes
+# within a session, so the sqlite_master lookup is cached for a minute
+@st.cache_data(ttl=60)
+def _product_indexes():
+    with pool.read() as conn:
+        rows = conn.execute("SELECT name FROM sqlite_master WHERE type='index' AND tbl_name='Products'").fetchall()
+    return [r[0] for r in rows]
+
+# Helper function to invalidate cached reads after a successful write
+def clear_caches():
+    _category_maps.clear()
+    _cached_products.clear()
+    _cached_product_options.clear()
+    _cached_product.clear()
+    _cached_report_bundle.clear()
+
 # PRODUCTS PAGE (CRUD)
 if page == "Products":
     st.header("Product Management")
     
+    # Show the result of a delete triggered by the button callback on the previous run
+    notice = st.session_state.pop('product_notice', None)
+    if notice:
+        kind, message = notice
+        if kind == "success":
+            st.success(message)
+        else:
+            st.error(message)
+    
     # Get all categories for dropdown
-    categories = get_all_categories()
-    category_dict = {name: cat_id for cat_id, name in categories}
+    maps = _category_maps()
+    categories = maps.categories
+    category_dict = maps.id_by_name
+    category_names = maps.names
+    category_name_to_index = maps.index_by_name
     
     if not categories:
         st.warning("⚠️ No categories found. Please add categories first in the Categories page.")
@@ -61,7 +183,8 @@ if page == "Products":
         # Load product data if in edit mode
         edit_product = None
         if st.session_state.edit_mode and st.session_state.editing_product_id:
-            edit_product = get_product_by_id(st.session_state.editing_product_id)
+            # Per-id cache entry: each rerun unpickles just this row, not the whole product list
+            edit_product = _cached_product(st.session_state.editing_product_id)
         
         with st.expander("➕ Add New Product" if not st.session_state.edit_mode else "✏️ Edit Product", expanded=st.session_state.edit_mode):
             with st.form("product_form", clear_on_submit=not st.session_state.edit_mode):
@@ -69,11 +192,10 @@ if page == "Products":
                 default_name = edit_product['name'] if edit_product else ""
                 default_price = float(edit_product['price']) if edit_product else 0.0
                 default_stock = int(edit_product['stock']) if edit_product else 0
-                default_category = edit_product['category_name'] if edit_product else list(category_dict.keys())[0]
+                default_category = edit_product['category_name'] if edit_product else category_names[0]
                 
                 # Find the index of the default category
-                category_options = list(category_dict.keys())
-                default_category_index = category_options.index(default_category) if default_category in category_options else 0
+                default_category_index = category_name_to_index.get(default_category, 0)
                 
                 product_name = st.text_input("Product Name *", value=default_name)
                 col1, col2 = st.columns(2)
@@ -84,7 +206,7 @@ if page == "Products":
                 
                 product_category = st.selectbox(
                     "Category *",
-                    options=category_options,
+                    options=category_names,
                     index=default_category_index
                 )
                 
@@ -103,6 +225,7 @@ if page == "Products":
                             )
                             if success:
                                 st.success("✅ Product updated successfully!")
+                                clear_caches()
                                 reset_form()
                                 st.rerun()
                             else:
@@ -116,6 +239,7 @@ if page == "Products":
                             )
                             if success:
                                 st.success("✅ Product added successfully!")
+                                clear_caches()
                                 st.rerun()
                             else:
                                 st.error("❌ Failed to add product.")
@@ -124,46 +248,42 @@ if page == "Products":
     
     # Products Table
     st.subheader("All Products")
-    products = get_all_products()
+    products = _cached_products()
     
     if products:
+        import pandas as pd
+        
         # Convert to DataFrame for display
-        df = pd.DataFrame([{
-            'ID': p['product_id'],
-            'Name': p['name'],
-            'Price': f"${p['price']:.2f}",
-            'Stock': p['stock'],
-            'Category': p['category_name']
-        } for p in products])
+        # Columns stay numeric (sortable); currency formatting is applied by the Styler
+        df = pd.DataFrame.from_records(products, columns=['product_id', 'name', 'price', 'stock', 'category_name']).rename(columns={
+            'product_id': 'ID',
+            'name': 'Name',
+            'price': 'Price',
+            'stock': 'Stock',
+            'category_name': 'Category'
+        })
         
-        st.dataframe(df, use_container_width=True, hide_index=True)
+        show_table_window(df, key="products_start_row", formats={'Price': '${:.2f}'})
         
         # Edit/Delete Actions
         st.subheader("Edit or Delete Product")
-        product_options = {f"{p['name']} (ID: {p['product_id']})": p['product_id'] for p in products}
+        product_options = _cached_product_options()
         selected_product_key = st.selectbox("Select a product to edit or delete:", options=list(product_options.keys()))
         
         if selected_product_key:
-            selected_product_id = product_options[selected_product_key]
-            product = get_product_by_id(selected_product_id)
+            product = product_options[selected_product_key]
+            selected_product_id = product['product_id']
             
             if product:
                 col1, col2 = st.columns(2)
                 
                 with col1:
-                    if st.button("✏️ Edit Product", use_container_width=True):
-                        st.session_state.edit_mode = True
-                        st.session_state.editing_product_id = selected_product_id
-                        st.rerun()
+                    st.button("✏️ Edit Product", use_container_width=True,
+                              on_click=start_edit, args=(selected_product_id,))
                 
                 with col2:
-                    if st.button("🗑️ Delete Product", use_container_width=True, type="primary"):
-                        if delete_product(selected_product_id):
-                            st.success("✅ Product deleted successfully!")
-                            reset_form()
-                            st.rerun()
-                        else:
-                            st.error("❌ Failed to delete product.")
+                    st.button("🗑️ Delete Product", use_container_width=True, type="primary",
+                              on_click=delete_product_clicked, args=(selected_product_id,))
     else:
         st.info("No products found. Add your first product using the form above.")
 
@@ -171,15 +291,16 @@ if page == "Products":
 elif page == "Reports":
     st.header("📊 Inventory Reports")
     
-    categories = get_all_categories()
-    category_dict = {name: cat_id for cat_id, name in categories}
+    maps = _category_maps()
+    categories = maps.categories
+    category_dict = maps.id_by_name
+    category_names = maps.names
     
     # Category filter - multi-select
     if categories:
-        category_options = list(category_dict.keys())
         selected_category_names = st.multiselect(
             "Filter by Categories (select multiple):",
-            options=category_options,
+            options=category_names,
             default=[]
         )
         
@@ -196,7 +317,7 @@ elif page == "Reports":
         category_name = "All Categories"
         st.warning("⚠️ No categories found.")
     
-    report = get_category_report(category_ids=category_ids if category_ids else None)
+    report, products = _cached_report_bundle(tuple(sorted(category_ids or ())))
     
     # Display metrics
     col1, col2, col3 = st.columns(3)
@@ -221,18 +342,19 @@ elif page == "Reports":
     
     # Display products table
     st.subheader(f"Products in {category_name}")
-    products = get_products_by_category(category_ids=category_ids if category_ids else None)
     
     if products:
-        df = pd.DataFrame([{
-            'Name': p['name'],
-            'Price': f"${p['price']:.2f}",
-            'Stock': p['stock'],
-            'Value': f"${p['price'] * p['stock']:.2f}",
-            'Category': p['category_name']
-        } for p in products])
+        import pandas as pd
         
-        st.dataframe(df, use_container_width=True, hide_index=True)
+        df = pd.DataFrame.from_records(products, columns=['name', 'price', 'stock', 'value', 'category_name']).rename(columns={
+            'name': 'Name',
+            'price': 'Price',
+            'stock': 'Stock',
+            'value': 'Value',
+            'category_name': 'Category'
+        })
+        
+        show_table_window(df, key="report_start_row", formats={'Price': '${:.2f}', 'Value': '${:.2f}'})
     else:
         st.info(f"No products found in {category_name}.")
 
@@ -250,6 +372,7 @@ elif page == "Categories":
                 if category_name.strip():
                     if add_category(category_name.strip()):
                         st.success("✅ Category added successfully!")
+                        clear_caches()
                         st.rerun()
                     else:
                         st.error("❌ Category name already exists or invalid.")
@@ -258,15 +381,20 @@ elif page == "Categories":
     
     # Categories List
     st.subheader("All Categories")
-    categories = get_all_categories()
+    maps = _category_maps()
+    categories = maps.categories
+    category_options = maps.id_by_label
     
     if categories:
-        df = pd.DataFrame([{'ID': cat_id, 'Name': name} for cat_id, name in categories])
-        st.dataframe(df, use_container_width=True, hide_index=True)
+        import pandas as pd
+        
+        # Small static list - st.table renders plain HTML and skips the Arrow/dataframe path.
+        # ID is used as the index since st.table always shows it
+        df = pd.DataFrame(categories, columns=['ID', 'Name']).set_index('ID')
+        st.table(df)
         
         # Delete Category Section
         st.subheader("Delete Category")
-        category_options = {f"{name} (ID: {cat_id})": cat_id for cat_id, name in categories}
         selected_category_key = st.selectbox("Select a category to delete:", options=list(category_options.keys()))
         
         if selected_category_key:
@@ -276,6 +404,7 @@ elif page == "Categories":
             if st.button("🗑️ Delete Category", type="primary"):
                 if delete_category(selected_category_id):
                     st.success("✅ Category deleted successfully!")
+                    clear_caches()
                     st.rerun()
                 else:
                     st.error("❌ Cannot delete category. It may have products associated with it or doesn't exist.")
@@ -287,9 +416,10 @@ elif page == "Testing":
     st.header("🧪 Stage 3 Features Testing")
     st.markdown("---")
     
-    tab1, tab2, tab3 = st.tabs(["SQL Injection Protection", "Index Verification", "Transaction Testing"])
-    
-    with tab1:
+    # Each tab body runs as a fragment, so clicking a button inside a tab only
+    # reruns that tab instead of the whole script
+    @fragment
+    def _sql_injection_tab():
         st.subheader("SQL Injection Protection Test")
         st.markdown("""
         **How it works:** All queries use parameterized statements (prepared statements) with `?` placeholders.
@@ -307,8 +437,9 @@ elif page == "Testing":
         
         if st.button("Test SQL Injection Protection"):
             # This uses the safe parameterized query
-            result = add_category(malicious_input)
-            if result:
+            new_row = add_category(malicious_input)
+            if new_row:
+                clear_caches()
                 st.success("✅ Category added safely!")
                 st.info(f"**Result:** The input `{malicious_input}` was stored as a literal string, NOT executed as SQL.")
                 st.markdown("""
@@ -319,15 +450,27 @@ elif page == "Testing":
                 """)
                 
                 # Show that the table still exists
-                categories = get_all_categories()
-                st.success(f"✅ Categories table still exists with {len(categories)} categories!")
+                st.success(f"✅ Categories table still exists with {get_category_count()} categories!")
                 
-                # Show the malicious input was stored safely
-                if categories:
-                    st.code(f"Latest category: {categories[-1][1]}", language="text")
+                # Show the malicious input was stored safely (row returned by the INSERT)
+                st.code(f"Latest category: {new_row['name']}", language="text")
             else:
                 st.warning("Category name might already exist. Try a different name.")
         
+        st.markdown("---")
+        st.markdown("### Seed Demo Categories")
+        st.markdown("Insert a batch of demo categories in one transaction (`executemany` with the same parameterized query).")
+        
+        seed_count = st.number_input("Number of demo categories:", min_value=1, max_value=1000, value=10, step=1)
+        
+        if st.button("Seed Demo Categories"):
+            added = add_categories_bulk([f"Demo Category {i}" for i in range(1, seed_count + 1)])
+            if added:
+                clear_caches()
+                st.success(f"✅ Added {added} demo categories in a single transaction!")
+            else:
+                st.warning("No categories added - the demo categories may already exist.")
+        
         st.markdown("---")
         st.markdown("### Test 2: View Safe Query Code")
         with st.expander("Show parameterized query code"):
@@ -339,30 +482,34 @@ cursor.execute('INSERT INTO Categories (name) VALUES (?)', (name,))
 cursor.execute(f"INSERT INTO Categories (name) VALUES ('{name}')")
             """, language="python")
     
-    with tab2:
+    @fragment
+    def _index_tab():
         st.subheader("Index Verification")
         st.markdown("""
         **Indexes created:**
         - `idx_products_category_id` on `Products(category_id)`
         - `idx_products_name` on `Products(name)`
+        - `idx_products_name_cover` on `Products(name, category_id, price, stock)` (covering index)
         """)
         
-        if st.button("Check Indexes in Database"):
-            conn = get_connection()
-            cursor = conn.cursor()
-            
-            # Get indexes on Products table
-            cursor.execute("SELECT name FROM sqlite_master WHERE type='index' AND tbl_name='Products'")
-            indexes = cursor.fetchall()
+        col1, col2 = st.columns(2)
+        with col1:
+            check_clicked = st.button("Check Indexes in Database")
+        with col2:
+            if st.button("🔄 Refresh Index List"):
+                _product_indexes.clear()
+                check_clicked = True
+        
+        if check_clicked:
+            # Index names on the Products table (cached - schema rarely changes)
+            indexes = _product_indexes()
             
             st.markdown("### Indexes Found:")
             if indexes:
                 for idx in indexes:
-                    st.success(f"✅ {idx[0]}")
+                    st.success(f"✅ {idx}")
             else:
                 st.warning("No indexes found. Make sure you've run the app at least once.")
-            
-            conn.close()
         
         st.markdown("---")
         st.markdown("### Query Plan Analysis")
@@ -370,57 +517,25 @@ cursor.execute(f"INSERT INTO Categories (name) VALUES ('{name}')")
         
         test_query = st.selectbox(
             "Select query to test:",
-            [
-                "JOIN with ORDER BY (Products page)",
-                "WHERE category_id = ? (Reports page)",
-                "Aggregation with WHERE (Reports page)",
-                "ORDER BY name only"
-            ]
+            list(_EXPLAIN_QUERIES.keys())
         )
         
         if st.button("Show Query Plan"):
-            conn = get_connection()
-            cursor = conn.cursor()
-            
-            queries = {
-                "JOIN with ORDER BY (Products page)": '''
-                    SELECT p.product_id, p.name, p.price, p.stock, c.name as category_name
-                    FROM Products p
-                    JOIN Categories c ON p.category_id = c.category_id
-                    ORDER BY p.name
-                ''',
-                "WHERE category_id = ? (Reports page)": '''
-                    SELECT p.product_id, p.name, p.price, p.stock, c.name as category_name
-                    FROM Products p
-                    JOIN Categories c ON p.category_id = c.category_id
-                    WHERE p.category_id = 1
-                    ORDER BY p.name
-                ''',
-                "Aggregation with WHERE (Reports page)": '''
-                    SELECT ROUND(AVG(price), 2), SUM(stock), SUM(price * stock)
-                    FROM Products
-                    WHERE category_id = 1
-                ''',
-                "ORDER BY name only": '''
-                    SELECT * FROM Products ORDER BY name
-                '''
-            }
-            
-            query = queries[test_query]
+            query, params = _EXPLAIN_QUERIES[test_query]
             
             st.markdown("**Query:**")
             st.code(query, language="sql")
+            if params:
+                st.caption(f"Sample parameters: {params}")
             
-            cursor.execute(f"EXPLAIN QUERY PLAN {query}")
-            plan = cursor.fetchall()
+            # Borrow a pooled connection so it's only used by this thread while the query runs
+            with pool.read() as conn:
+                plan = conn.execute("EXPLAIN QUERY PLAN " + query, params).fetchall()
             
             st.markdown("**Query Plan:**")
-            plan_text = ""
-            uses_index = False
-            for row in plan:
-                plan_text += f"{row}\n"
-                if 'idx_products_category_id' in str(row) or 'idx_products_name' in str(row):
-                    uses_index = True
+            plan_text = "".join(f"{row}\n" for row in plan)
+            index_markers = ('idx_products_category_id', 'idx_products_name', 'CategoryStats USING INTEGER PRIMARY KEY')
+            uses_index = any(marker in str(row) for row in plan for marker in index_markers)
             
             st.code(plan_text, language="text")
             
@@ -428,14 +543,19 @@ cursor.execute(f"INSERT INTO Categories (name) VALUES ('{name}')")
                 st.success("✅ Index is being used!")
                 if 'idx_products_category_id' in plan_text:
                     st.info("Using: `idx_products_category_id`")
-                if 'idx_products_name' in plan_text:
+                if 'idx_products_name_cover' in plan_text:
+                    st.info("Using: `idx_products_name_cover` (covering index, no sort step)")
+                elif 'idx_products_name' in plan_text:
                     st.info("Using: `idx_products_name`")
+                if 'CategoryStats USING INTEGER PRIMARY KEY' in plan_text:
+                    st.info("Using: `CategoryStats` primary key (one row lookup per selected category)")
+                if 'COVERING INDEX' in plan_text:
+                    st.info("Index-only scan: SQLite reads every column it needs from the index, with no table lookups")
             else:
                 st.warning("⚠️ Index may not be used (check if you have data in the database)")
-            
-            conn.close()
     
-    with tab3:
+    @fragment
+    def _transaction_tab():
         st.subheader("Transaction and Isolation Level Testing")
         st.markdown("""
         **Isolation Level:** SERIALIZABLE
@@ -445,17 +565,18 @@ cursor.execute(f"INSERT INTO Categories (name) VALUES ('{name}')")
         
         st.markdown("### Test 1: Multi-Step Transaction (Category Deletion)")
         st.markdown("""
-        The `delete_category()` function uses a transaction to ensure atomicity:
-        1. Check if category has products
+        The `delete_category()` function runs one DELETE statement, which SQLite executes as a single transaction:
+        1. Check if category has products (`NOT EXISTS` in the `WHERE` clause)
         2. Delete category if safe
-        3. Reset sequence if table becomes empty
+        3. Reset sequence if table becomes empty (`AFTER DELETE` trigger)
         
         All steps happen atomically - either all succeed or all fail.
         """)
         
-        categories = get_all_categories()
+        maps = _category_maps()
+        categories = maps.categories
+        cat_options = maps.id_by_label
         if categories:
-            cat_options = {f"{name} (ID: {cat_id})": cat_id for cat_id, name in categories}
             selected_cat = st.selectbox("Select category to test deletion:", list(cat_options.keys()))
             
             if st.button("Test Transaction (Try to Delete)"):
@@ -463,6 +584,7 @@ cursor.execute(f"INSERT INTO Categories (name) VALUES ('{name}')")
                 result = delete_category(cat_id)
                 
                 if result:
+                    clear_caches()
                     st.success("✅ Transaction completed successfully!")
                     st.info("All steps (check products, delete category, reset sequence) completed atomically.")
                 else:
@@ -479,13 +601,13 @@ cursor.execute(f"INSERT INTO Categories (name) VALUES ('{name}')")
         - No lost updates or inconsistent states
         """)
         
-        products = get_all_products()
+        products = _cached_products()
         if products:
-            prod_options = {f"{p['name']} (ID: {p['product_id']})": p['product_id'] for p in products}
+            prod_options = _cached_product_options()
             selected_prod = st.selectbox("Select product to simulate update:", list(prod_options.keys()))
             
-            selected_prod_id = prod_options[selected_prod]
-            product = get_product_by_id(selected_prod_id)
+            product = prod_options[selected_prod]
+            selected_prod_id = product['product_id']
             
             if product:
                 st.markdown(f"**Current Stock:** {product['stock']}")
@@ -502,6 +624,7 @@ cursor.execute(f"INSERT INTO Categories (name) VALUES ('{name}')")
                     )
                     
                     if result:
+                        clear_caches()
                         st.success("✅ Update completed in transaction!")
                         st.info("""
                         **In a real concurrent scenario:**
@@ -520,7 +643,20 @@ cursor.execute(f"INSERT INTO Categories (name) VALUES ('{name}')")
 # In db.py, get_connection():
 conn = sqlite3.connect(DB_PATH, isolation_level=None)
 # SQLite uses SERIALIZABLE by default
+conn.execute('PRAGMA busy_timeout=5000')
+
+# In db.py, init_db() (WAL mode is persistent, so it's set once):
 # WAL mode enabled for better concurrency
 conn.execute('PRAGMA journal_mode=WAL')
             """, language="python")
-
+    
+    tab1, tab2, tab3 = st.tabs(["SQL Injection Protection", "Index Verification", "Transaction Testing"])
+    
+    with tab1:
+        _sql_injection_tab()
+    
+    with tab2:
+        _index_tab()
+    
+    with tab3:
+        _transaction_tab()
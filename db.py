@@ -9,6 +9,8 @@ SECURITY FEATURES (Stage 3):
 2. Database Indexes: 
    - idx_products_category_id: Optimizes JOINs and WHERE clauses on category_id
    - idx_products_name: Optimizes ORDER BY name queries
+   - idx_products_name_cover: Covering index so the Products listing is served in name
+     order straight from the index (no table lookups, no sort step)
    
 3. Transactions with SERIALIZABLE Isolation: Ensures ACID properties and prevents
    concurrency issues (dirty reads, non-repeatable reads, phantom reads) when multiple
@@ -17,10 +19,229 @@ SECURITY FEATURES (Stage 3):
 
 import sqlite3
 import os
-from typing import List, Tuple, Optional
+import json
+import queue
+import threading
+from collections import namedtuple
+from contextlib import contextmanager
+from typing import Callable, Iterator, List, Tuple, Optional
 
 DB_PATH = os.path.join(os.path.dirname(__file__), 'data.db')
 
+# Number of pooled read connections (WAL allows many readers alongside one writer)
+POOL_READERS = 4
+
+# Size of each connection's prepared-statement cache (keyed by SQL text)
+STATEMENT_CACHE_SIZE = 256
+
+# Full schema, run by init_db() as a single script inside one transaction
+_SCHEMA_SQL = '''
+BEGIN IMMEDIATE TRANSACTION;
+
+-- Create Categories table
+CREATE TABLE IF NOT EXISTS Categories (
+    category_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    name TEXT UNIQUE NOT NULL
+);
+
+-- Create Products table
+CREATE TABLE IF NOT EXISTS Products (
+    product_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    name TEXT NOT NULL,
+    price REAL NOT NULL,
+    stock INTEGER NOT NULL DEFAULT 0,
+    category_id INTEGER NOT NULL,
+    FOREIGN KEY (category_id) REFERENCES Categories(category_id)
+);
+
+-- Create indexes to optimize common queries
+-- Index 1: Products.category_id - Used in JOINs and WHERE clauses
+CREATE INDEX IF NOT EXISTS idx_products_category_id
+ON Products(category_id);
+
+-- Index 2: Products.name - Used in ORDER BY name queries
+CREATE INDEX IF NOT EXISTS idx_products_name
+ON Products(name);
+
+-- Index 3: Covering index for the Products listing - holds every column the
+-- ORDER BY name query reads, so SQLite scans the index in order and skips the table
+CREATE INDEX IF NOT EXISTS idx_products_name_cover
+ON Products(name, category_id, price, stock);
+
+-- Index 4: Categories.name - Already has UNIQUE index, but explicit for clarity
+-- Note: UNIQUE constraint automatically creates an index, but we document it
+
+-- Triggers: reset the AUTOINCREMENT sequence to 0 when the last row is deleted,
+-- so delete_category/delete_product don't need extra statements to do it.
+-- A single UPDATE is enough: the sqlite_sequence row exists once anything has been
+-- inserted, and if it doesn't, there is nothing to reset (numbering starts at 1 anyway).
+-- Dropped and recreated so databases created with an older trigger body pick this one up.
+DROP TRIGGER IF EXISTS trg_categories_reset_seq;
+CREATE TRIGGER trg_categories_reset_seq
+AFTER DELETE ON Categories
+WHEN NOT EXISTS (SELECT 1 FROM Categories)
+BEGIN
+    UPDATE sqlite_sequence SET seq = 0 WHERE name = 'Categories';
+END;
+
+DROP TRIGGER IF EXISTS trg_products_reset_seq;
+CREATE TRIGGER trg_products_reset_seq
+AFTER DELETE ON Products
+WHEN NOT EXISTS (SELECT 1 FROM Products)
+BEGIN
+    UPDATE sqlite_sequence SET seq = 0 WHERE name = 'Products';
+END;
+
+-- Per-category aggregates for the Reports page, kept in sync with Products by the
+-- triggers below so reports read one row per category instead of scanning Products
+CREATE TABLE IF NOT EXISTS CategoryStats (
+    category_id INTEGER PRIMARY KEY,
+    cnt INTEGER NOT NULL,
+    sum_price REAL NOT NULL,
+    sum_stock INTEGER NOT NULL,
+    sum_value REAL NOT NULL
+);
+
+-- Rebuild from Products on startup, so existing databases (and any drift) are brought in line
+DELETE FROM CategoryStats;
+INSERT INTO CategoryStats (category_id, cnt, sum_price, sum_stock, sum_value)
+SELECT category_id, COUNT(*), SUM(price), SUM(stock), SUM(price * stock)
+FROM Products
+GROUP BY category_id;
+
+DROP TRIGGER IF EXISTS trg_products_stats_insert;
+CREATE TRIGGER trg_products_stats_insert
+AFTER INSERT ON Products
+BEGIN
+    INSERT INTO CategoryStats (category_id, cnt, sum_price, sum_stock, sum_value)
+    VALUES (NEW.category_id, 1, NEW.price, NEW.stock, NEW.price * NEW.stock)
+    ON CONFLICT(category_id) DO UPDATE SET
+        cnt = cnt + 1,
+        sum_price = sum_price + excluded.sum_price,
+        sum_stock = sum_stock + excluded.sum_stock,
+        sum_value = sum_value + excluded.sum_value;
+END;
+
+-- Rows that reach cnt = 0 are removed so float sums don't leave rounding residue behind
+DROP TRIGGER IF EXISTS trg_products_stats_delete;
+CREATE TRIGGER trg_products_stats_delete
+AFTER DELETE ON Products
+BEGIN
+    UPDATE CategoryStats SET
+        cnt = cnt - 1,
+        sum_price = sum_price - OLD.price,
+        sum_stock = sum_stock - OLD.stock,
+        sum_value = sum_value - OLD.price * OLD.stock
+    WHERE category_id = OLD.category_id;
+    DELETE FROM CategoryStats WHERE category_id = OLD.category_id AND cnt = 0;
+END;
+
+-- An update is applied as "remove OLD from its category, add NEW to its category",
+-- which also covers products moving between categories
+DROP TRIGGER IF EXISTS trg_products_stats_update;
+CREATE TRIGGER trg_products_stats_update
+AFTER UPDATE OF price, stock, category_id ON Products
+BEGIN
+    UPDATE CategoryStats SET
+        cnt = cnt - 1,
+        sum_price = sum_price - OLD.price,
+        sum_stock = sum_stock - OLD.stock,
+        sum_value = sum_value - OLD.price * OLD.stock
+    WHERE category_id = OLD.category_id;
+    DELETE FROM CategoryStats WHERE category_id = OLD.category_id AND cnt = 0;
+    INSERT INTO CategoryStats (category_id, cnt, sum_price, sum_stock, sum_value)
+    VALUES (NEW.category_id, 1, NEW.price, NEW.stock, NEW.price * NEW.stock)
+    ON CONFLICT(category_id) DO UPDATE SET
+        cnt = cnt + 1,
+        sum_price = sum_price + excluded.sum_price,
+        sum_stock = sum_stock + excluded.sum_stock,
+        sum_value = sum_value + excluded.sum_value;
+END;
+
+COMMIT;
+'''
+
+# Canonical queries - kept as module-level constants so every call passes the
+# identical SQL text and hits the connection's prepared-statement cache
+_SQL_ALL_CATEGORIES = 'SELECT category_id, name FROM Categories ORDER BY category_id'
+
+_SQL_INSERT_CATEGORY = 'INSERT INTO Categories (name) VALUES (?) RETURNING category_id, name'
+
+# Skips names that already exist without touching the AUTOINCREMENT sequence
+# (INSERT OR IGNORE would use up an id for every duplicate and leave gaps)
+_SQL_INSERT_CATEGORY_IF_MISSING = '''
+    INSERT INTO Categories (name)
+    SELECT ?1
+    WHERE NOT EXISTS (SELECT 1 FROM Categories WHERE name = ?1)
+'''
+
+_SQL_COUNT_CATEGORIES = 'SELECT COUNT(*) FROM Categories'
+
+_SQL_DELETE_CATEGORY = '''
+    DELETE FROM Categories
+    WHERE category_id = ?1
+      AND NOT EXISTS (SELECT 1 FROM Products WHERE category_id = ?1)
+    RETURNING 1
+'''
+
+# Category names are filled in from the categories cache (see iter_all_products)
+_SQL_ALL_PRODUCTS = '''
+    SELECT product_id, name, price, stock, category_id
+    FROM Products
+    ORDER BY name
+'''
+
+_SQL_PRODUCT_BY_ID = '''
+    SELECT p.product_id, p.name, p.price, p.stock, p.category_id, c.name as category_name
+    FROM Products p
+    JOIN Categories c ON p.category_id = c.category_id
+    WHERE p.product_id = ?
+'''
+
+# {where} is filled with the fixed category filter below (or left empty). The filter
+# binds any number of ids as one JSON array, so both statements have constant SQL text
+# (and cached plans), and the filtered one can still search idx_products_category_id
+_SQL_PRODUCTS_WITH_VALUE = '''
+    SELECT p.product_id, p.name, p.price, p.stock, p.price * p.stock as value, p.category_id, c.name as category_name
+    FROM Products p
+    JOIN Categories c ON p.category_id = c.category_id
+    {where}
+    ORDER BY p.name
+'''
+
+_SQL_PRODUCTS_IN_CATEGORIES = _SQL_PRODUCTS_WITH_VALUE.format(
+    where='WHERE p.category_id IN (SELECT value FROM json_each(?))'
+)
+
+_SQL_PRODUCTS_ALL_WITH_VALUE = _SQL_PRODUCTS_WITH_VALUE.format(where='')
+
+_SQL_INSERT_PRODUCT = '''
+    INSERT INTO Products (name, price, stock, category_id)
+    VALUES (?, ?, ?, ?)
+'''
+
+_SQL_UPDATE_PRODUCT = '''
+    UPDATE Products
+    SET name = ?, price = ?, stock = ?, category_id = ?
+    WHERE product_id = ?
+'''
+
+_SQL_DELETE_PRODUCT = 'DELETE FROM Products WHERE product_id = ? RETURNING 1'
+
+# Reads the per-category aggregates maintained by triggers (see CategoryStats)
+_SQL_REPORT = '''
+    SELECT 
+        SUM(sum_price) / SUM(cnt) as avg_price,
+        SUM(sum_stock) as total_stock,
+        SUM(sum_value) as total_value
+    FROM CategoryStats
+    {where}
+'''
+
+_SQL_REPORT_IN_CATEGORIES = _SQL_REPORT.format(where='WHERE category_id IN (SELECT value FROM json_each(?))')
+
+_SQL_REPORT_ALL = _SQL_REPORT.format(where='')
+
 
 def get_connection():
     """Get a database connection with SERIALIZABLE isolation level for transaction safety.
@@ -32,312 +253,369 @@ def get_connection():
     
     This ensures ACID properties and prevents concurrency issues when multiple users
     access the database simultaneously. We use isolation_level=None to enable manual
-    transaction control with BEGIN TRANSACTION statements.
+    transaction control with BEGIN statements (BEGIN IMMEDIATE for write transactions, so the
+    write lock is taken at the start and waits are bounded by busy_timeout).
     """
-    conn = sqlite3.connect(DB_PATH, check_same_thread=False, isolation_level=None)
+    conn = sqlite3.connect(DB_PATH, check_same_thread=False, isolation_level=None,
+                           cached_statements=STATEMENT_CACHE_SIZE)
     conn.row_factory = sqlite3.Row  # Enable column access by name
-    # Enable WAL mode for better concurrency (if supported)
-    # WAL mode allows multiple readers and one writer simultaneously
-    try:
-        conn.execute('PRAGMA journal_mode=WAL')
-    except Exception:
-        pass  # WAL mode not supported, continue with default
+    # Per-connection tuning - applied once, since pooled connections are reused.
+    # WAL mode is stored in the database file itself, so init_db() sets it once.
+    # busy_timeout makes a blocked writer wait up to 5s instead of failing with "database is locked"
+    conn.execute('PRAGMA busy_timeout=5000')
+    conn.execute('PRAGMA synchronous=NORMAL')
+    conn.execute('PRAGMA cache_size=-20000')
+    conn.execute('PRAGMA temp_store=MEMORY')
+    conn.execute('PRAGMA mmap_size=268435456')
     return conn
 
 
+class _ConnectionPool:
+    """Long-lived connections shared by all CRUD helpers.
+    
+    Opening a connection re-opens the database, -wal and -shm files and replays the
+    PRAGMAs, so connections are created on first use and then handed out again
+    instead of being closed after every query. A connection is only ever checked out
+    by one thread at a time, so SQLite's per-connection mutex is never contended
+    (check_same_thread=False just lets a connection move between Streamlit's
+    short-lived script threads - binding one per thread would reopen it every rerun):
+    - read(): one of up to POOL_READERS connections, taken from a queue
+    - write(): the single write connection, guarded by a lock so writers are
+      serialized in-process (SQLite only allows one writer at a time anyway)
+    
+    Both take row=True when the caller reads columns by name (sqlite3.Row); otherwise
+    rows come back as plain tuples, which skips building a Row object per row.
+    factory overrides both with a custom row_factory (e.g. _product_row).
+    """
+    
+    def __init__(self, max_readers: int = POOL_READERS):
+        self._readers = queue.Queue()
+        self._max_readers = max_readers
+        self._reader_count = 0
+        self._reader_count_lock = threading.Lock()
+        self._writer = None
+        self._write_lock = threading.Lock()
+    
+    def _acquire_reader(self) -> sqlite3.Connection:
+        try:
+            return self._readers.get_nowait()
+        except queue.Empty:
+            pass
+        with self._reader_count_lock:
+            if self._reader_count < self._max_readers:
+                # Count the slot only once the connection has opened, so a failed connect
+                # doesn't permanently shrink the pool
+                conn = get_connection()
+                self._reader_count += 1
+                return conn
+        # All readers are busy - wait for one to be returned
+        return self._readers.get()
+    
+    @contextmanager
+    def read(self, row: bool = False, factory: Optional[Callable] = None):
+        conn = self._acquire_reader()
+        conn.row_factory = factory or (sqlite3.Row if row else None)
+        try:
+            yield conn
+        finally:
+            self._readers.put(conn)
+    
+    @contextmanager
+    def write(self, row: bool = False):
+        with self._write_lock:
+            if self._writer is None:
+                self._writer = get_connection()
+            self._writer.row_factory = sqlite3.Row if row else None
+            try:
+                yield self._writer
+            finally:
+                # Never hand the next writer a connection with an open transaction
+                if self._writer.in_transaction:
+                    self._writer.rollback()
+
+
+pool = _ConnectionPool()
+
+# In-process copy of the Categories table - it changes rarely but is read on every
+# page render. None means "not loaded"; writers reset it after a successful commit.
+_categories_cache: Optional[List[Tuple[int, str]]] = None
+_categories_lock = threading.Lock()
+
+
+def _invalidate_categories_cache():
+    global _categories_cache
+    with _categories_lock:
+        _categories_cache = None
+
+
 def init_db():
     """Initialize the database with Categories and Products tables, and create indexes.
     
     Indexes created:
     1. idx_products_category_id: Speeds up JOINs and WHERE clauses filtering by category
     2. idx_products_name: Speeds up ORDER BY name queries
-    3. idx_categories_name: Speeds up category name lookups (UNIQUE constraint also creates an index)
-    """
-    conn = get_connection()
-    cursor = conn.cursor()
-    
-    # Begin transaction for atomic table and index creation
-    cursor.execute('BEGIN TRANSACTION')
+    3. idx_products_name_cover: Covers (name, category_id, price, stock) for the Products listing
+    4. idx_categories_name: Speeds up category name lookups (UNIQUE constraint also creates an index)
     
-    try:
-        # Create Categories table
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS Categories (
-                category_id INTEGER PRIMARY KEY AUTOINCREMENT,
-                name TEXT UNIQUE NOT NULL
-            )
-        ''')
-        
-        # Create Products table
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS Products (
-                product_id INTEGER PRIMARY KEY AUTOINCREMENT,
-                name TEXT NOT NULL,
-                price REAL NOT NULL,
-                stock INTEGER NOT NULL DEFAULT 0,
-                category_id INTEGER NOT NULL,
-                FOREIGN KEY (category_id) REFERENCES Categories(category_id)
-            )
-        ''')
-        
-        # Create indexes to optimize common queries
-        # Index 1: Products.category_id - Used in JOINs and WHERE clauses
-        cursor.execute('''
-            CREATE INDEX IF NOT EXISTS idx_products_category_id 
-            ON Products(category_id)
-        ''')
-        
-        # Index 2: Products.name - Used in ORDER BY name queries
-        cursor.execute('''
-            CREATE INDEX IF NOT EXISTS idx_products_name 
-            ON Products(name)
-        ''')
-        
-        # Index 3: Categories.name - Already has UNIQUE index, but explicit for clarity
-        # Note: UNIQUE constraint automatically creates an index, but we document it
+    Triggers created:
+    - trg_categories_reset_seq / trg_products_reset_seq: Reset the AUTOINCREMENT sequence
+      to 0 when the last row of the table is deleted
+    - trg_products_stats_insert / _delete / _update: Keep the CategoryStats summary table
+      (count, price/stock/value sums per category) in sync with Products
+    """
+    with pool.write() as conn:
+        # Enable WAL mode for better concurrency (if supported)
+        # WAL mode allows multiple readers and one writer simultaneously. It is persistent,
+        # so this runs once here (outside the transaction - SQLite can't switch modes inside one)
+        # rather than on every connection
+        try:
+            conn.execute('PRAGMA journal_mode=WAL')
+        except Exception:
+            pass  # WAL mode not supported, continue with default
         
-        conn.commit()
-    except Exception as e:
-        conn.rollback()
-        raise e
-    finally:
-        conn.close()
+        # Create all tables, indexes and triggers in one script / one transaction
+        try:
+            conn.executescript(_SCHEMA_SQL)
+        except Exception as e:
+            if conn.in_transaction:
+                conn.rollback()
+            raise e
 
 
 # Category CRUD operations
 def get_all_categories() -> List[Tuple[int, str]]:
-    """Get all categories as (category_id, name) tuples."""
-    conn = get_connection()
-    cursor = conn.cursor()
-    cursor.execute('SELECT category_id, name FROM Categories ORDER BY category_id')
-    categories = cursor.fetchall()
-    conn.close()
-    return [(row[0], row[1]) for row in categories]
+    """Get all categories as (category_id, name) tuples.
+    Served from the in-process cache after the first call; add_category,
+    add_categories_bulk and delete_category invalidate it.
+    """
+    global _categories_cache
+    with _categories_lock:
+        if _categories_cache is None:
+            with pool.read() as conn:
+                _categories_cache = conn.execute(_SQL_ALL_CATEGORIES).fetchall()
+        return list(_categories_cache)
 
 
-def add_category(name: str) -> bool:
-    """Add a new category. Returns True if successful, False if name already exists."""
-    try:
-        conn = get_connection()
-        cursor = conn.cursor()
-        cursor.execute('INSERT INTO Categories (name) VALUES (?)', (name,))
-        conn.commit()
-        conn.close()
-        return True
-    except sqlite3.IntegrityError:
-        conn.close()
-        return False
+def add_category(name: str) -> Optional[sqlite3.Row]:
+    """Add a new category. Returns the inserted (category_id, name) row if successful,
+    None if name already exists. RETURNING (SQLite 3.35+) hands back the new row so
+    callers don't need to re-query the table.
+    """
+    with pool.write(row=True) as conn:
+        try:
+            new_row = conn.execute(_SQL_INSERT_CATEGORY, (name,)).fetchall()[0]
+            conn.commit()
+            _invalidate_categories_cache()
+            return new_row
+        except sqlite3.IntegrityError:
+            return None
+
+
+def add_categories_bulk(names: List[str]) -> int:
+    """Add many categories in a single transaction. Returns the number of categories added.
+    Uses executemany so the INSERT is parsed once and all rows share one commit.
+    Names that already exist are skipped instead of failing the batch, and use up no ids.
+    """
+    with pool.write() as conn:
+        try:
+            # Begin transaction so the whole batch is committed at once. IMMEDIATE takes the
+            # write lock up front (waiting up to busy_timeout) instead of failing with
+            # SQLITE_BUSY when a read lock has to be upgraded mid-transaction
+            conn.execute('BEGIN IMMEDIATE')
+            
+            added = conn.executemany(_SQL_INSERT_CATEGORY_IF_MISSING, [(n,) for n in names]).rowcount
+            
+            conn.commit()
+            _invalidate_categories_cache()
+            return added
+        except Exception:
+            conn.rollback()
+            return 0
+
+
+def get_category_count() -> int:
+    """Get the number of categories."""
+    with pool.read() as conn:
+        return conn.execute(_SQL_COUNT_CATEGORIES).fetchone()[0]
 
 
 def delete_category(category_id: int) -> bool:
     """Delete a category. Returns True if successful, False if category has products or doesn't exist.
     Automatically resets sequence to 0 if this is the last category.
     
-    Uses a transaction with SERIALIZABLE isolation to ensure atomicity:
-    - Checks if category has products (uses idx_products_category_id index)
-    - Deletes category if safe
-    - Resets sequence if table becomes empty
+    Runs as a single DELETE statement, which SQLite executes atomically:
+    - Checks if category has products (NOT EXISTS in the WHERE clause, uses idx_products_category_id index)
+    - Deletes category if safe (RETURNING tells us whether a row was deleted)
+    - Resets sequence if table becomes empty (trg_categories_reset_seq trigger)
     All operations are atomic - either all succeed or all fail.
     """
-    conn = None
-    try:
-        conn = get_connection()
-        cursor = conn.cursor()
-        
-        # Begin transaction for atomic multi-step operation
-        cursor.execute('BEGIN TRANSACTION')
-        
-        # Check if category has products (benefits from idx_products_category_id index)
-        cursor.execute('SELECT COUNT(*) FROM Products WHERE category_id = ?', (category_id,))
-        product_count = cursor.fetchone()[0]
-        
-        if product_count > 0:
-            conn.rollback()
-            conn.close()
-            return False  # Cannot delete category with products
-        
-        # Delete the category
-        cursor.execute('DELETE FROM Categories WHERE category_id = ?', (category_id,))
-        
-        # Check if table is now empty and reset sequence
-        cursor.execute('SELECT COUNT(*) FROM Categories')
-        remaining_count = cursor.fetchone()[0]
-        if remaining_count == 0:
-            cursor.execute('DELETE FROM sqlite_sequence WHERE name = "Categories"')
-            cursor.execute('INSERT INTO sqlite_sequence (name, seq) VALUES ("Categories", 0)')
-        
-        conn.commit()
-        conn.close()
-        return True
-    except Exception:
-        if conn:
+    with pool.write() as conn:
+        try:
+            deleted = conn.execute(_SQL_DELETE_CATEGORY, (category_id,)).fetchall()
+            conn.commit()
+            if deleted:
+                _invalidate_categories_cache()
+            return len(deleted) > 0  # Nothing deleted: category has products or doesn't exist
+        except Exception:
             conn.rollback()
-            conn.close()
-        return False
+            return False
+
+
+# Row type for product fetches. Fields follow _SQL_PRODUCT_BY_ID's SELECT order, which is
+# _SQL_ALL_PRODUCTS's columns plus category_name (appended from the cache by iter_all_products)
+ProductRow = namedtuple('ProductRow', 'product_id name price stock category_id category_name')
+
+
+def _product_row(cursor: sqlite3.Cursor, row: tuple) -> ProductRow:
+    """row_factory for product fetches: a namedtuple is cheaper to build and read than sqlite3.Row."""
+    return ProductRow(*row)
 
 
 # Product CRUD operations
-def get_all_products() -> List[sqlite3.Row]:
+def get_all_products() -> List[ProductRow]:
     """Get all products with their category names.
     
     Query benefits from indexes:
-    - idx_products_category_id: Speeds up JOIN on Products.category_id = Categories.category_id
-    - idx_products_name: Speeds up ORDER BY p.name
+    - idx_products_name_cover: Serves the whole query (ORDER BY name) as a covering index
+      scan with no sort step. product_id is the rowid, so it is stored in every index entry
+      and needs no extra column
+    
+    There is no JOIN to Categories: category names come from the get_all_categories cache.
     """
-    conn = get_connection()
-    cursor = conn.cursor()
-    cursor.execute('''
-        SELECT p.product_id, p.name, p.price, p.stock, p.category_id, c.name as category_name
-        FROM Products p
-        JOIN Categories c ON p.category_id = c.category_id
-        ORDER BY p.name
-    ''')
-    products = cursor.fetchall()
-    conn.close()
-    return products
+    return list(iter_all_products())
+
+
+def iter_all_products(batch: int = 1000) -> Iterator[ProductRow]:
+    """Yield all products with their category names, fetching batch rows at a time.
+    Keeps at most one batch in memory instead of the whole result set; the pooled
+    connection is held until the generator is exhausted or closed.
+    Same query and index usage as get_all_products.
+    """
+    # Loaded before checking out a reader, so the cache fill never waits on a second one
+    names = dict(get_all_categories())
+    reloaded = False
+    try:
+        with pool.read() as conn:
+            cursor = conn.execute(_SQL_ALL_PRODUCTS)
+            while rows := cursor.fetchmany(batch):
+                for r in rows:
+                    name = names.get(r[4])
+                    if name is None and not reloaded:
+                        # Category added by another process since the cache was filled - re-read
+                        # on the connection already held (at most once per call)
+                        reloaded = True
+                        names = dict(conn.execute(_SQL_ALL_CATEGORIES).fetchall())
+                        name = names.get(r[4])
+                    if name is None:
+                        continue  # No matching category - the old JOIN dropped these rows too
+                    yield ProductRow(*r, name)
+    finally:
+        # Only after the reader is returned: get_all_categories holds _categories_lock while
+        # it waits for a reader, so taking the lock here with one checked out could deadlock.
+        # In a finally so closing the generator early still drops the stale cache.
+        if reloaded:
+            _invalidate_categories_cache()
 
 
 def get_products_by_category(category_id: Optional[int] = None, category_ids: Optional[List[int]] = None) -> List[sqlite3.Row]:
     """Get products, optionally filtered by category_id or list of category_ids.
+    Each row includes value (price * stock), computed by SQLite.
     
+    Either filter is bound as one JSON array (see _SQL_PRODUCTS_IN_CATEGORIES).
     Query benefits from indexes:
-    - idx_products_category_id: Speeds up WHERE p.category_id = ? and WHERE p.category_id IN (...)
-    - idx_products_category_id: Speeds up JOIN on Products.category_id = Categories.category_id
-    - idx_products_name: Speeds up ORDER BY p.name
+    - idx_products_category_id: Speeds up WHERE p.category_id IN (...)
+    - idx_products_name_cover: Serves ORDER BY p.name as a covering index scan when unfiltered
+    - Categories primary key: Speeds up JOIN on Products.category_id = Categories.category_id
     Used in: Reports page for filtering products by category
     """
-    conn = get_connection()
-    cursor = conn.cursor()
+    with pool.read(row=True) as conn:
+        return _fetch_products_by_category(conn, category_id, category_ids)
+
+
+def _category_filter(category_id: Optional[int] = None, category_ids: Optional[List[int]] = None) -> Optional[str]:
+    """Build the bind for the category-filtered queries: a JSON array of ids, or None for all categories."""
     if category_ids and len(category_ids) > 0:
         # Filter by multiple categories
-        placeholders = ','.join('?' * len(category_ids))
-        cursor.execute(f'''
-            SELECT p.product_id, p.name, p.price, p.stock, p.category_id, c.name as category_name
-            FROM Products p
-            JOIN Categories c ON p.category_id = c.category_id
-            WHERE p.category_id IN ({placeholders})
-            ORDER BY p.name
-        ''', tuple(category_ids))
+        return json.dumps(list(category_ids))
     elif category_id:
-        cursor.execute('''
-            SELECT p.product_id, p.name, p.price, p.stock, p.category_id, c.name as category_name
-            FROM Products p
-            JOIN Categories c ON p.category_id = c.category_id
-            WHERE p.category_id = ?
-            ORDER BY p.name
-        ''', (category_id,))
-    else:
-        cursor.execute('''
-            SELECT p.product_id, p.name, p.price, p.stock, p.category_id, c.name as category_name
-            FROM Products p
-            JOIN Categories c ON p.category_id = c.category_id
-            ORDER BY p.name
-        ''')
-    products = cursor.fetchall()
-    conn.close()
-    return products
+        return json.dumps([category_id])
+    return None
+
+
+def _fetch_products_by_category(conn: sqlite3.Connection, category_id: Optional[int] = None, category_ids: Optional[List[int]] = None) -> List[sqlite3.Row]:
+    """Run the get_products_by_category query on an existing connection."""
+    ids = _category_filter(category_id, category_ids)
+    if ids is None:
+        return conn.execute(_SQL_PRODUCTS_ALL_WITH_VALUE).fetchall()
+    return conn.execute(_SQL_PRODUCTS_IN_CATEGORIES, (ids,)).fetchall()
 
 
 def add_product(name: str, price: float, stock: int, category_id: int) -> bool:
     """Add a new product. Returns True if successful."""
-    conn = None
-    try:
-        conn = get_connection()
-        cursor = conn.cursor()
-        cursor.execute('''
-            INSERT INTO Products (name, price, stock, category_id)
-            VALUES (?, ?, ?, ?)
-        ''', (name, price, stock, category_id))
-        conn.commit()
-        conn.close()
-        return True
-    except Exception:
-        if conn:
-            conn.close()
-        return False
+    return add_products_bulk([(name, price, stock, category_id)]) == 1
+
+
+def add_products_bulk(rows: List[Tuple[str, float, int, int]]) -> int:
+    """Add many products in a single transaction. Returns the number of products added.
+    Each row is (name, price, stock, category_id). Uses executemany so all rows share
+    one commit; if any row fails, the whole batch is rolled back and 0 is returned.
+    """
+    with pool.write() as conn:
+        try:
+            # Take the write lock up front so the batch commits in one go
+            conn.execute('BEGIN IMMEDIATE')
+            
+            added = conn.executemany(_SQL_INSERT_PRODUCT, rows).rowcount
+            
+            conn.commit()
+            return added
+        except Exception:
+            conn.rollback()
+            return 0
 
 
 def update_product(product_id: int, name: str, price: float, stock: int, category_id: int) -> bool:
     """Update an existing product. Returns True if successful.
     
-    Uses a transaction with SERIALIZABLE isolation to ensure atomicity.
+    Runs as a single UPDATE statement, which SQLite wraps in its own implicit transaction
+    with SERIALIZABLE isolation - no explicit BEGIN/COMMIT round-trips are needed.
     In a concurrent scenario, if two users try to update the same product simultaneously,
     the SERIALIZABLE isolation level ensures that one transaction completes before the other
     begins, preventing lost updates and maintaining data consistency.
     """
-    conn = None
-    try:
-        conn = get_connection()
-        cursor = conn.cursor()
-        
-        # Begin transaction for atomic operation
-        cursor.execute('BEGIN TRANSACTION')
-        
-        cursor.execute('''
-            UPDATE Products
-            SET name = ?, price = ?, stock = ?, category_id = ?
-            WHERE product_id = ?
-        ''', (name, price, stock, category_id, product_id))
-        
-        conn.commit()
-        conn.close()
-        return True
-    except Exception:
-        if conn:
+    with pool.write() as conn:
+        try:
+            conn.execute(_SQL_UPDATE_PRODUCT, (name, price, stock, category_id, product_id))
+            conn.commit()
+            return True
+        except Exception:
             conn.rollback()
-            conn.close()
-        return False
+            return False
 
 
 def delete_product(product_id: int) -> bool:
-    """Delete a product. Returns True if successful.
+    """Delete a product. Returns True if successful, False if it doesn't exist.
     Automatically resets sequence to 0 if this is the last product.
     
-    Uses a transaction with SERIALIZABLE isolation to ensure atomicity:
-    - Deletes the product
-    - Checks if table is empty and resets sequence if needed
+    Runs as a single DELETE statement, which SQLite executes atomically:
+    - Deletes the product (RETURNING tells us whether a row was deleted)
+    - Resets sequence if table becomes empty (trg_products_reset_seq trigger)
     All operations are atomic - either all succeed or all fail.
     """
-    conn = None
-    try:
-        conn = get_connection()
-        cursor = conn.cursor()
-        
-        # Begin transaction for atomic multi-step operation
-        cursor.execute('BEGIN TRANSACTION')
-        
-        cursor.execute('DELETE FROM Products WHERE product_id = ?', (product_id,))
-        
-        # Check if table is now empty and reset sequence
-        cursor.execute('SELECT COUNT(*) FROM Products')
-        remaining_count = cursor.fetchone()[0]
-        if remaining_count == 0:
-            cursor.execute('DELETE FROM sqlite_sequence WHERE name = "Products"')
-            cursor.execute('INSERT INTO sqlite_sequence (name, seq) VALUES ("Products", 0)')
-        
-        conn.commit()
-        conn.close()
-        return True
-    except Exception:
-        if conn:
+    with pool.write() as conn:
+        try:
+            deleted = conn.execute(_SQL_DELETE_PRODUCT, (product_id,)).fetchall()
+            conn.commit()
+            return len(deleted) > 0
+        except Exception:
             conn.rollback()
-            conn.close()
-        return False
+            return False
 
 
-def get_product_by_id(product_id: int) -> Optional[sqlite3.Row]:
+def get_product_by_id(product_id: int) -> Optional[ProductRow]:
     """Get a single product by ID."""
-    conn = get_connection()
-    cursor = conn.cursor()
-    cursor.execute('''
-        SELECT p.product_id, p.name, p.price, p.stock, p.category_id, c.name as category_name
-        FROM Products p
-        JOIN Categories c ON p.category_id = c.category_id
-        WHERE p.product_id = ?
-    ''', (product_id,))
-    product = cursor.fetchone()
-    conn.close()
-    return product
+    with pool.read(factory=_product_row) as conn:
+        return conn.execute(_SQL_PRODUCT_BY_ID, (product_id,)).fetchone()
 
 
 # Report functions
@@ -345,46 +623,25 @@ def get_category_report(category_id: Optional[int] = None, category_ids: Optiona
     """Get report metrics for products, optionally filtered by category or list of categories.
     Returns dict with avg_price, total_stock, total_value.
     
-    Query benefits from indexes:
-    - idx_products_category_id: Speeds up WHERE category_id = ? and WHERE category_id IN (...)
+    Reads the CategoryStats summary table (one row per category, kept up to date by
+    triggers on Products), so the cost depends on the number of categories rather than
+    the number of products. A filter is a primary-key search on CategoryStats.category_id
+    (see _SQL_REPORT_IN_CATEGORIES).
     Used in: Reports page for calculating aggregate statistics (average price, total stock, total value)
     """
-    conn = get_connection()
-    cursor = conn.cursor()
-    
-    if category_ids and len(category_ids) > 0:
-        # Filter by multiple categories
-        placeholders = ','.join('?' * len(category_ids))
-        cursor.execute(f'''
-            SELECT 
-                ROUND(AVG(price), 2) as avg_price,
-                SUM(stock) as total_stock,
-                SUM(price * stock) as total_value
-            FROM Products
-            WHERE category_id IN ({placeholders})
-        ''', tuple(category_ids))
-    elif category_id:
-        cursor.execute('''
-            SELECT 
-                ROUND(AVG(price), 2) as avg_price,
-                SUM(stock) as total_stock,
-                SUM(price * stock) as total_value
-            FROM Products
-            WHERE category_id = ?
-        ''', (category_id,))
+    with pool.read() as conn:
+        return _fetch_category_report(conn, category_id, category_ids)
+
+
+def _fetch_category_report(conn: sqlite3.Connection, category_id: Optional[int] = None, category_ids: Optional[List[int]] = None) -> dict:
+    """Run the get_category_report query on an existing connection."""
+    ids = _category_filter(category_id, category_ids)
+    if ids is None:
+        result = conn.execute(_SQL_REPORT_ALL).fetchone()
     else:
-        cursor.execute('''
-            SELECT 
-                ROUND(AVG(price), 2) as avg_price,
-                SUM(stock) as total_stock,
-                SUM(price * stock) as total_value
-            FROM Products
-        ''')
+        result = conn.execute(_SQL_REPORT_IN_CATEGORIES, (ids,)).fetchone()
     
-    result = cursor.fetchone()
-    conn.close()
-    
-    # Ensure avg_price is properly rounded
+    # Rounded here rather than with ROUND() in SQL
     avg_price = round(float(result[0]), 2) if result[0] is not None else 0.0
     
     return {
@@ -393,3 +650,14 @@ def get_category_report(category_id: Optional[int] = None, category_ids: Optiona
         'total_value': result[2] if result[2] is not None else 0.0
     }
 
+
+def get_report_bundle(category_ids: Optional[List[int]] = None) -> Tuple[dict, List[sqlite3.Row]]:
+    """Get the report metrics and the matching product list in one call.
+    Returns (report, products) - the same payloads as get_category_report and
+    get_products_by_category, but both queries run on a single connection.
+    Used in: Reports page
+    """
+    with pool.read(row=True) as conn:
+        report = _fetch_category_report(conn, category_ids=category_ids)
+        products = _fetch_products_by_category(conn, category_ids=category_ids)
+    return report, products